@@ -6,7 +6,12 @@ This app serves the digest results data through a web interface,
 replacing the static HTML file with server-side data loading.
 """
 
-from flask import Flask, render_template, jsonify
+import os
+import threading
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, render_template, jsonify, request
 from pathlib import Path
 from utils import load_json_file_safe, all_plots
 
@@ -16,6 +21,98 @@ app = Flask(__name__)
 DATA_FILE = "digest_results.json"
 DEBUG = True
 
+# Parsed data file and derived values, invalidated when the file changes
+_cache = {
+    "mtime": None,
+    "data": [],
+    "by_key": {},
+    "stats": None,
+    "encoded": {},
+    "plots": None,
+}
+
+# Flask serves requests on multiple threads, so cache reads and writes take this
+_cache_lock = threading.Lock()
+
+# Matplotlib is not thread-safe, so all rendering goes through one worker
+_plot_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def get_cached_data():
+    """Load the data file, reusing the parsed copy until its mtime changes.
+
+    Returns the mtime the data was read at along with the data and its
+    dedup_key index, so anything derived from them can be cached against the
+    right version of the file.
+    """
+    try:
+        mtime = os.stat(DATA_FILE).st_mtime
+    except FileNotFoundError:
+        mtime = None
+
+    with _cache_lock:
+        if mtime != _cache["mtime"]:
+            _cache["data"] = load_json_file_safe(DATA_FILE)
+            _cache["by_key"] = {
+                d["dedup_key"]: d for d in _cache["data"] if d.get("dedup_key")
+            }
+            _cache["mtime"] = mtime
+            _cache["stats"] = None
+            _cache["encoded"] = {}
+            _cache["plots"] = None
+
+        return _cache["mtime"], _cache["data"], _cache["by_key"]
+
+
+def get_cached_plots(mtime, data):
+    """Render the analysis plots once per data file, sharing the result.
+
+    If the data file changed since `data` was read, the plots are rendered
+    without being cached so they can't be served for the newer file.
+    """
+    with _cache_lock:
+        if _cache["mtime"] != mtime:
+            future = _plot_executor.submit(all_plots, data)
+        else:
+            if _cache["plots"] is None:
+                _cache["plots"] = _plot_executor.submit(all_plots, data)
+            future = _cache["plots"]
+
+    try:
+        return future.result()
+    except Exception:
+        # Don't keep serving a failed render
+        with _cache_lock:
+            if _cache["plots"] is future:
+                _cache["plots"] = None
+        raise
+
+
+def cached_json_response(name, mtime, payload):
+    """Build a JSON response tagged with the mtime its payload was read at.
+
+    The encoded body is kept under `name` so repeat requests skip serialization,
+    unless the data file changed while the payload was being built.
+    """
+    # Without a data file there's no version to tag the response with
+    etag = str(mtime) if mtime is not None else None
+    if etag is not None and request.if_none_match.contains(etag):
+        return "", 304
+
+    with _cache_lock:
+        body = _cache["encoded"].get(name) if _cache["mtime"] == mtime else None
+
+    if body is None:
+        body = orjson.dumps(payload)
+        with _cache_lock:
+            if _cache["mtime"] == mtime:
+                _cache["encoded"][name] = body
+
+    response = Response(body, mimetype="application/json")
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
 
 @app.route("/")
 def home():
@@ -33,8 +130,8 @@ def results():
 def get_data():
     """API endpoint to get digest results data."""
     try:
-        data = load_json_file_safe(DATA_FILE)
-        return jsonify(data)
+        mtime, data, _ = get_cached_data()
+        return cached_json_response("data", mtime, data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -43,7 +140,12 @@ def get_data():
 def get_stats():
     """API endpoint to get summary statistics."""
     try:
-        data = load_json_file_safe(DATA_FILE)
+        mtime, data, _ = get_cached_data()
+
+        with _cache_lock:
+            stats = _cache["stats"] if _cache["mtime"] == mtime else None
+        if stats is not None:
+            return cached_json_response("stats", mtime, stats)
 
         if not data:
             return jsonify(
@@ -56,26 +158,33 @@ def get_stats():
 
         # Calculate statistics
         total_items = len(data)
-        sources = list(set(item.get("source", "Unknown") for item in data))
+        sources = {item.get("source", "Unknown") for item in data}
 
-        # Score ranges
-        high_score = sum(1 for item in data if item.get("weighted_score", 0) >= 70)
-        medium_score = sum(
-            1 for item in data if 30 <= item.get("weighted_score", 0) < 70
-        )
-        low_score = sum(1 for item in data if item.get("weighted_score", 0) < 30)
-
-        return jsonify(
-            {
-                "total_items": total_items,
-                "sources": sorted(sources),
-                "score_ranges": {
-                    "high": high_score,
-                    "medium": medium_score,
-                    "low": low_score,
-                },
-            }
+        # Score ranges (unevaluated items count as zero)
+        scores = np.fromiter(
+            (item.get("weighted_score") or 0 for item in data),
+            dtype=float,
+            count=total_items,
         )
+        high_score = int((scores >= 70).sum())
+        low_score = int((scores < 30).sum())
+        medium_score = total_items - high_score - low_score
+
+        stats = {
+            "total_items": total_items,
+            "sources": sorted(sources),
+            "score_ranges": {
+                "high": high_score,
+                "medium": medium_score,
+                "low": low_score,
+            },
+        }
+
+        # Only keep the stats if the data hasn't changed since it was read
+        with _cache_lock:
+            if _cache["mtime"] == mtime:
+                _cache["stats"] = stats
+        return cached_json_response("stats", mtime, stats)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -84,14 +193,10 @@ def get_stats():
 def get_item_details(item_id):
     """API endpoint to get detailed information about a specific item."""
     try:
-        data = load_json_file_safe(DATA_FILE)
+        _, _, by_key = get_cached_data()
 
         # Find item by dedup_key
-        item = None
-        for d in data:
-            if d.get("dedup_key") == item_id:
-                item = d
-                break
+        item = by_key.get(item_id)
 
         if not item:
             return jsonify({"error": "Item not found"}), 404
@@ -119,12 +224,14 @@ def health_check():
 def analysis():
     """Serve the analysis page with plots."""
     try:
-        data = load_json_file_safe(DATA_FILE)
+        mtime, data, _ = get_cached_data()
         if not data:
             return render_template(
                 "analysis.html", error="No data available for analysis", plots={}
             )
-        return render_template("analysis.html", plots=all_plots(data), error=None)
+        return render_template(
+            "analysis.html", plots=get_cached_plots(mtime, data), error=None
+        )
 
     except Exception as e:
         return render_template(
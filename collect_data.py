@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Set
 from utils import (
@@ -13,16 +15,24 @@ from utils import (
     get_config_value,
 )
 
+# Evaluation fields that a fresh collection must not overwrite
+PRESERVED_FIELDS = frozenset({"response", "prompt", "prompt_hash", "eval_date"})
+
+# Directories under sources/ that are never sources themselves
+IGNORED_SOURCE_DIRS = frozenset({"__pycache__", ".git", ".venv"})
+
 
 def find_source_configs() -> List[Path]:
     """Find all source config.toml files"""
-    sources_dir = Path("sources")
     config_files = []
 
-    for item in sources_dir.iterdir():
-        if item.is_dir() and item.name != "__pycache__":
-            config_path = item / "config.toml"
-            if config_path.exists():
+    # DirEntry caches the file type from readdir, so is_dir() needs no stat
+    with os.scandir("sources") as entries:
+        for entry in entries:
+            if entry.name in IGNORED_SOURCE_DIRS or not entry.is_dir():
+                continue
+            config_path = Path(entry.path) / "config.toml"
+            if config_path.is_file():
                 config_files.append(config_path)
 
     return config_files
@@ -50,18 +60,20 @@ def deduplicate_items(all_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove duplicate items based on dedup key"""
     seen_keys: Set[str] = set()
     unique_items = []
-    duplicates_removed = 0
+
+    # Bind the hot methods once for the loop
+    seen_add = seen_keys.add
+    append = unique_items.append
 
     for item in all_items:
         dedup_key = get_dedup_key(item)
 
         if dedup_key not in seen_keys:
-            seen_keys.add(dedup_key)
+            seen_add(dedup_key)
             item["dedup_key"] = dedup_key
-            unique_items.append(item)
-        else:
-            duplicates_removed += 1
+            append(item)
 
+    duplicates_removed = len(all_items) - len(unique_items)
     if duplicates_removed > 0:
         print(f"Removed {duplicates_removed} duplicate items")
 
@@ -72,15 +84,18 @@ def merge_new_with_existing(
     existing_items: List[Dict[str, Any]], new_items: List[Dict[str, Any]]
 ) -> List[Dict[str, Any]]:
     """Merge new items with existing ones, preserving evaluations"""
-    # Create a map of existing items by dedup_key
+    # Create a map of existing items by dedup_key, re-keying them so files
+    # written with an older key scheme still match the new items
     existing_map = {}
     for item in existing_items:
         if "dedup_key" in item:
+            item["dedup_key"] = get_dedup_key(item)
             existing_map[item["dedup_key"]] = item
 
     merged_items = []
     new_count = 0
     updated_count = 0
+    now = get_current_timestamp()
 
     # Process new items
     for new_item in new_items:
@@ -91,18 +106,18 @@ def merge_new_with_existing(
             existing_item = existing_map[dedup_key]
 
             # Update data fields but preserve evaluation fields
-            for key, value in new_item.items():
-                if key not in ["response", "prompt", "prompt_hash", "eval_date"]:
-                    existing_item[key] = value
+            existing_item.update(
+                {k: v for k, v in new_item.items() if k not in PRESERVED_FIELDS}
+            )
 
             # Update collection timestamp
-            existing_item["last_collected"] = get_current_timestamp()
+            existing_item["last_collected"] = now
             merged_items.append(existing_item)
             updated_count += 1
         else:
             # New item
-            new_item["first_collected"] = get_current_timestamp()
-            new_item["last_collected"] = get_current_timestamp()
+            new_item["first_collected"] = now
+            new_item["last_collected"] = now
             new_item["num_evals"] = 0
             new_item["evals"] = []
             new_item["weighted_score"] = None
@@ -112,10 +127,9 @@ def merge_new_with_existing(
             new_count += 1
 
     # Add any existing items that weren't in the new batch
+    new_keys = {item["dedup_key"] for item in new_items}
     for existing_item in existing_items:
-        if "dedup_key" in existing_item and existing_item["dedup_key"] not in {
-            item["dedup_key"] for item in new_items
-        }:
+        if "dedup_key" in existing_item and existing_item["dedup_key"] not in new_keys:
             merged_items.append(existing_item)
 
     print(f"Added {new_count} new items, updated {updated_count} existing items")
@@ -145,18 +159,19 @@ def main():
     try:
         # Find and load each source's config.toml file
         print("Finding source configurations...")
-        source_config_paths = find_source_configs()
+        all_config_paths = find_source_configs()
+        source_config_paths = all_config_paths
 
         # Filter by specified source if provided
         if args.source:
             source_config_paths = [
-                path for path in source_config_paths if path.parent.name == args.source
+                path for path in all_config_paths if path.parent.name == args.source
             ]
             if not source_config_paths:
                 print(f"Source '{args.source}' not found.")
                 print("Available sources:")
                 all_source_names = [
-                    config_path.parent.name for config_path in find_source_configs()
+                    config_path.parent.name for config_path in all_config_paths
                 ]
                 for source_name in all_source_names:
                     print(f"  {source_name}")
@@ -180,18 +195,32 @@ def main():
 
         all_new_items = []
 
+        # Resolve each source's data loader
+        jobs = []
         for config_path in source_config_paths:
             source_name = config_path.parent.name
-            print(f"\nProcessing source: {source_name}")
-
-            # Fetch data by running the source's data loader
-            loader_path = get_config_value("loader", config_path)
+            loader_path = get_config_value("loader", config_path, "")
             if not loader_path:
                 print(f"No loader specified for source {source_name}")
                 continue
+            jobs.append((config_path, loader_path))
 
-            print(f"Running data loader: {loader_path}")
-            data_items = run_data_loader(loader_path)
+        if not jobs:
+            print("⭕ No data loaders to run.")
+            return
+
+        # Loaders are independent subprocesses, so run them all at once
+        print(f"\nRunning {len(jobs)} data loaders...")
+        with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as executor:
+            futures = [
+                executor.submit(run_data_loader, loader_path) for _, loader_path in jobs
+            ]
+
+        # Gather results in source order so output stays deterministic
+        for (config_path, loader_path), future in zip(jobs, futures):
+            source_name = config_path.parent.name
+            print(f"\nProcessing source: {source_name} ({loader_path})")
+            data_items = future.result()
 
             if not data_items:
                 print(f"No data returned from loader for source {source_name}")
@@ -2,8 +2,9 @@
 
 import argparse
 import sys
-import json
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any
 from utils import (
     get_config_value,
@@ -16,22 +17,45 @@ from utils import (
     call_ollama,
 )
 
+# Minimum seconds between progress saves while evaluating
+SAVE_INTERVAL = 5
+
+
+def eval_scores(evals: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """Collect one score field from every evaluation into an array"""
+    return np.fromiter(
+        (e["response"][key] for e in evals), dtype=np.int64, count=len(evals)
+    )
+
 
 def weighted_score(evals: List[Dict[str, Any]]) -> float:
     """Aggregate a weighted score from evaluations"""
-    total_score = 0
-    total_weight = 0
-    for eval in evals:
-        i_score = eval["response"]["importance_score"]
-        i_weight = eval["response"]["confidence_score"] + 100
-        total_score += i_score * i_weight
-        total_weight += i_weight
-    return int(total_score / total_weight) if total_weight > 0 else 0
+    scores = eval_scores(evals, "importance_score")
+    weights = eval_scores(evals, "confidence_score") + 100
+    total_weight = weights.sum()
+    return int((scores * weights).sum() / total_weight) if total_weight > 0 else 0
 
 
 def median_confidence(evals: List[Dict[str, Any]]) -> float:
     """Aggregate a median confidence score from evaluations"""
-    return int(np.median([e["response"]["confidence_score"] for e in evals]))
+    return int(np.median(eval_scores(evals, "confidence_score")))
+
+
+def evaluate_item(item: Dict[str, Any], index: int, total: int) -> Dict[str, Any]:
+    """Assemble the prompt for an item and run it through its evaluator"""
+    prompt = assemble_prompt(item)
+
+    # Get eval provider and model
+    eval_provider = get_config_value("eval_provider", item["config_path"], "ollama")
+    eval_model = get_config_value("eval_model", item["config_path"], "llama3.2")
+    print(
+        f"Evaluating item {index}/{total}: {item['source']} - {item['title']} with {eval_provider}/{eval_model}"
+    )
+
+    # Run through evaluator
+    if eval_provider == "ollama":
+        return call_ollama(item, prompt)
+    raise ValueError(f"Unknown eval provider: {eval_provider}")
 
 
 def main():
@@ -79,6 +103,12 @@ def main():
             f"Starting evaluation process with {max_rounds if max_rounds != float('inf') else 'infinite'} rounds..."
         )
 
+    # Number of evaluations to run at the same time
+    concurrency = max(1, get_config_int("eval_concurrency", "base.toml", 4))
+
+    # Evaluations applied since the last save
+    unsaved_evals = 0
+
     try:
         # Load data
         print(f"Loading data from {args.input}...")
@@ -86,12 +116,14 @@ def main():
         print(f"Loaded {len(all_items)} items")
 
         # Filter items by recency
-        recent_items = [item for item in all_items if is_item_recent(item)]
+        now = time.time()
+        recent_items = [item for item in all_items if is_item_recent(item, now)]
         print(f"Filtered to {len(recent_items)} items based on source criteria")
 
         # Run multiple evaluation rounds
         total_evaluated = 0
         round_num = 1
+        last_save = time.monotonic()
 
         while round_num <= max_rounds:
             print(f"\n--- Evaluation Round {round_num} of {max_rounds} ---")
@@ -110,67 +142,75 @@ def main():
                     f"Found {len(items_to_evaluate)} items needing evaluation (round {round_num})"
                 )
 
-            # Process each item in this round
+            # Evaluations are independent HTTP calls, so run several at once and
+            # apply the results here as they finish
             round_evaluated = 0
-            for i, item in enumerate(items_to_evaluate):
-                try:
-                    # Assemble the prompt
-                    prompt = assemble_prompt(item)
-
-                    # Get eval provider and model
-                    eval_provider = get_config_value(
-                        "eval_provider", item["config_path"], "ollama"
-                    )
-                    eval_model = get_config_value(
-                        "eval_model", item["config_path"], "llama3.2"
-                    )
-                    print(
-                        f"Evaluating item {i + 1}/{len(items_to_evaluate)}: {item['source']} - {item['title']} with {eval_provider}/{eval_model}"
-                    )
-
-                    # Run through evaluator
-                    if eval_provider == "ollama":
-                        eval_data = call_ollama(item, prompt)
-                    else:
-                        raise ValueError(f"Unknown eval provider: {eval_provider}")
-
-                    round_evaluated += 1
-                    total_evaluated += 1
-
-                    # Save and aggregate evals so far
-                    eval_data["round"] = round_num
-                    item["evals"].append(eval_data)
-                    item["num_evals"] += 1
-                    item["weighted_score"] = weighted_score(item["evals"])
-                    item["median_confidence"] = median_confidence(item["evals"])
-                    item["last_eval"] = eval_data["eval_date"]
-
-                    # Print results and save
-                    print(
-                        f" Score: {eval_data['response']['importance_score']},"
-                        f" Confidence: {eval_data['response']['confidence_score']},"
-                        f" Cumulative Score: {item['weighted_score']}"
-                    )
-
-                    # Save after each evaluation to prevent data loss
-                    save_json_file(all_items, args.output)
-
-                except Exception as e:
-                    print(f"  Error evaluating item: {e}", file=sys.stderr)
-                    # Continue with other items rather than failing completely
-                    continue
-
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+            try:
+                futures = {
+                    executor.submit(
+                        evaluate_item, item, i + 1, len(items_to_evaluate)
+                    ): item
+                    for i, item in enumerate(items_to_evaluate)
+                }
+                for future in as_completed(futures):
+                    item = futures[future]
+                    try:
+                        eval_data = future.result()
+
+                        round_evaluated += 1
+                        total_evaluated += 1
+                        unsaved_evals += 1
+
+                        # Save and aggregate evals so far
+                        eval_data["round"] = round_num
+                        item["evals"].append(eval_data)
+                        item["num_evals"] += 1
+                        item["weighted_score"] = weighted_score(item["evals"])
+                        item["median_confidence"] = median_confidence(item["evals"])
+                        item["last_eval"] = eval_data["eval_date"]
+
+                        # Print results and save
+                        print(
+                            f" {item['title']}:"
+                            f" Score: {eval_data['response']['importance_score']},"
+                            f" Confidence: {eval_data['response']['confidence_score']},"
+                            f" Cumulative Score: {item['weighted_score']}"
+                        )
+
+                        # Save progress regularly to prevent data loss
+                        if time.monotonic() - last_save >= SAVE_INTERVAL:
+                            save_json_file(all_items, args.output)
+                            last_save = time.monotonic()
+                            unsaved_evals = 0
+
+                    except Exception as e:
+                        print(f"  Error evaluating item: {e}", file=sys.stderr)
+                        # Continue with other items rather than failing completely
+                        continue
+            finally:
+                # If we're bailing out mid-round, drop the queued evaluations
+                # rather than waiting for them all to finish
+                executor.shutdown(cancel_futures=True)
+
+            if round_evaluated:
+                save_json_file(all_items, args.output)
+                last_save = time.monotonic()
+                unsaved_evals = 0
             print(f"Round {round_num} completed: evaluated {round_evaluated} items")
             round_num += 1
 
     except Exception as e:
         print(f"Error in main: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        # Keep finished evaluations even on Ctrl-C or an unexpected error
+        if unsaved_evals:
+            save_json_file(all_items, args.output)
 
     # Final save
     print(f"Saving final results to {args.output}...")
-    with open(args.output, "w") as f:
-        json.dump(all_items, f, indent=2)
+    save_json_file(all_items, args.output)
 
     print("\nEvaluation process completed!")
     print(f"Total evaluations across all rounds: {total_evaluated}")
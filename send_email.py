@@ -1,13 +1,22 @@
 import json
 import os
 import argparse
+import heapq
 import tempfile
+import time
 from datetime import datetime
 from typing import Dict, List, Any
 import requests
 from collections import defaultdict
 import subprocess
-from utils import is_item_important, is_item_recent
+from jinja2 import Environment, FileSystemLoader
+from pathlib import Path
+from utils import is_item_important, is_item_recent, load_json_file
+
+# Compiled once; autoescaping keeps titles and LLM summaries from injecting markup
+email_template = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"), autoescape=True
+).get_template("email.html")
 
 
 def get_item_summary(item: Dict[str, Any]) -> str:
@@ -24,99 +33,31 @@ def get_item_summary(item: Dict[str, Any]) -> str:
     return "No summary available."
 
 
+def score_key(item: Dict[str, Any]) -> int:
+    """Sort key for ranking items by their aggregated score"""
+    return item["weighted_score"]
+
+
 def generate_html_email(items: List[Dict[str, Any]]) -> str:
     """Generate HTML email content"""
-    if not items:
-        return """
-        <html>
-        <body>
-        <h1>Weekly Digest</h1>
-        <p>No items found matching the criteria.</p>
-        </body>
-        </html>
-        """
-
-    # Get top 3 items
-    top_items = items[:3]
-
-    # Group remaining items by source
+    # Group items by source, highest scores first within each source and
+    # sources ordered by their best item
     grouped_items = defaultdict(list)
     for item in items:
         source = item.get("source", "Unknown")
         grouped_items[source].append(item)
+    for source_items in grouped_items.values():
+        source_items.sort(key=score_key, reverse=True)
+    grouped_items = dict(
+        sorted(grouped_items.items(), key=lambda kv: score_key(kv[1][0]), reverse=True)
+    )
 
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }}
-            h1 {{ color: #333; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
-            h2 {{ color: #555; margin-top: 30px; border-bottom: 1px solid #eee; padding-bottom: 5px; }}
-            h3 {{ color: #666; margin-top: 20px; }}
-            .top-items {{ background-color: #f9f9f9; padding: 15px; border-left: 4px solid #007cba; margin: 20px 0; }}
-            .item {{ margin: 15px 0; padding: 10px; border-left: 3px solid #ddd; }}
-            .item-title {{ font-weight: bold; color: #007cba; }}
-            .item-score {{ color: #888; font-size: 0.9em; }}
-            .item-summary {{ margin-top: 5px; color: #555; }}
-            a {{ color: #007cba; text-decoration: none; }}
-            a:hover {{ text-decoration: underline; }}
-            .footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; color: #888; font-size: 0.9em; }}
-        </style>
-    </head>
-    <body>
-        <h1>Weekly Digest</h1>
-
-        <div>
-            <h2>🏆 Top {len(top_items)} Items</h2>
-    """
-
-    for item in top_items:
-        score = item.get("weighted_score", 0) or 0
-        confidence = item.get("median_confidence", 0) or 0
-        html += f"""
-            <div class="item">
-                <div class="item-title">
-                    <a href="{item.get("link", "#")}" target="_blank">{item.get("title", "Untitled")}</a>
-                </div>
-                <div class="item-score">Score: {score} ({confidence}%) | Source: {item.get("source", "Unknown")}</div>
-            </div>
-        """
-
-    html += """
-        </div>
-
-        <h2>📚 All Items by Source</h2>
-    """
-
-    for source, source_items in grouped_items.items():
-        html += f"""
-        <h3>{source} ({len(source_items)} items)</h3>
-        """
-
-        for item in source_items:
-            score = item.get("weighted_score", 0) or 0
-            confidence = item.get("median_confidence", 0) or 0
-            summary = get_item_summary(item)
-
-            html += f"""
-            <div class="item">
-                <div class="item-title">
-                    <a href="{item.get("link", "#")}" target="_blank">{item.get("title", "Untitled")}</a>
-                </div>
-                <div class="item-score">Score: {score}, Confidence: {confidence}</div>
-                <div class="item-summary">{summary}</div>
-            </div>
-            """
-
-    html += f"""
-        <div class="footer">
-            <p>This digest was generated at {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}.</p>
-        </div>
-    </body>
-    </html>
-    """
-
-    return html
+    return email_template.render(
+        top_items=heapq.nlargest(3, items, key=score_key),
+        grouped_items=grouped_items,
+        get_item_summary=get_item_summary,
+        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    )
 
 
 def save_html_to_file(html_content: str, filename: str = "digest_email.html") -> str:
@@ -193,8 +134,7 @@ def main():
     # Load and process data
     print(f"Loading data from {args.input}...")
     try:
-        with open(args.input, "r") as f:
-            digest_results = json.load(f)
+        digest_results = load_json_file(args.input)
     except FileNotFoundError:
         print(f"Error: File {args.input} not found")
         return 1
@@ -204,14 +144,12 @@ def main():
 
     print(f"Loaded {len(digest_results)} total items")
 
-    # Filter and sort items
+    # Filter items, ranking is done per section when generating the email
     print("Filtering items using source-specific thresholds")
+    now = time.time()
     filtered_items = [
-        i for i in digest_results if is_item_important(i) and is_item_recent(i)
+        i for i in digest_results if is_item_important(i) and is_item_recent(i, now)
     ]
-    filtered_items = sorted(
-        filtered_items, key=lambda x: x["weighted_score"], reverse=True
-    )
     print(f"Found {len(filtered_items)} items matching criteria")
 
     if not filtered_items:
@@ -5,9 +5,9 @@
 # https://info.arxiv.org/help/api/index.html
 # https://arxiv.org/category_taxonomy
 
-import json
+import orjson
 import requests
-import feedparser
+from lxml import etree
 from datetime import datetime, timedelta, UTC
 import re
 import sys
@@ -19,6 +19,139 @@ from utils.config import get_config_int, get_config_list
 
 config_path = Path("sources/arxiv/config.toml")
 
+# Shared session so every category query reuses the same connection
+session = requests.Session()
+
+# The API responds with an Atom feed
+ATOM_NS = {"a": "http://www.w3.org/2005/Atom"}
+
+# Runs of whitespace, including the newlines the API wraps long text with
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fetch_category(category, cutoff_date, max_results_per_category):
+    """Downloads recent papers in a single Arxiv category"""
+    if isinstance(category, str):
+        category = category.strip()
+    else:
+        category = str(category).strip()
+
+    # Format date for ArXiv API (YYYYMMDD format)
+    cutoff_date_str = cutoff_date.strftime("%Y%m%d")
+    current_date_str = datetime.now(tz=UTC).strftime("%Y%m%d")
+
+    # Build ArXiv API query
+    # Search for papers submitted in the date range
+    query = (
+        f"cat:{category} AND submittedDate:[{cutoff_date_str}* TO {current_date_str}*]"
+    )
+
+    url = "http://export.arxiv.org/api/query"
+    params = {
+        "search_query": query,
+        "start": 0,
+        "max_results": max_results_per_category,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+    }
+
+    papers = []
+    try:
+        response = session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+
+        # Parse the Atom feed
+        entries = etree.fromstring(response.content).findall("a:entry", ATOM_NS)
+
+        if not entries:
+            print(f"No entries found for category {category}", file=sys.stderr)
+            return papers
+
+        # print(f"Got {len(entries)} entries for category {category}",file=sys.stderr)
+        for entry in entries:
+            try:
+                entry_title = entry.findtext("a:title", namespaces=ATOM_NS)
+
+                # Parse the submission date
+                published = entry.findtext("a:published", namespaces=ATOM_NS)
+                if not published:
+                    print(
+                        f"Warning: Entry missing publication date: {entry_title or 'Unknown'}",
+                        file=sys.stderr,
+                    )
+                    continue
+
+                submitted_date = datetime.fromisoformat(
+                    published.replace("Z", "+00:00")
+                )
+
+                # Double-check the date filter (API might return slightly outside range)
+                if submitted_date < cutoff_date:
+                    continue
+
+                # Extract authors, the last one listed is credited in the title
+                author_names = [
+                    name.text
+                    for name in entry.iterfind("a:author/a:name", ATOM_NS)
+                    if name.text
+                ]
+                main_author = author_names[-1] if author_names else ""
+                authors = list(set(author_names))
+
+                # Clean up title (remove newlines and extra spaces)
+                title = (
+                    WHITESPACE_RE.sub(" ", entry_title.strip())
+                    if entry_title is not None
+                    else "Unknown Title"
+                )
+
+                # Clean up abstract
+                summary = entry.findtext("a:summary", namespaces=ATOM_NS)
+                abstract = (
+                    WHITESPACE_RE.sub(" ", summary.strip())
+                    if summary is not None
+                    else ""
+                )
+
+                # Extract ArXiv ID from the link
+                entry_id = entry.findtext("a:id", default="", namespaces=ATOM_NS)
+                arxiv_id = entry_id.split("/")[-1]
+
+                # Get categories
+                paper_categories = [
+                    tag.get("term") for tag in entry.iterfind("a:category", ATOM_NS)
+                ]
+
+                link = entry.find('a:link[@rel="alternate"]', ATOM_NS)
+
+                paper = {
+                    "title": title,
+                    "author": main_author,
+                    "all_authors": authors,
+                    "url": link.get("href") if link is not None else entry_id,
+                    "abstract": abstract,
+                    "arxiv_id": arxiv_id,
+                    "submitted_date": submitted_date.isoformat(),
+                    "categories": paper_categories,
+                    "primary_category": category,
+                    # "full_entry": entry,
+                }
+
+                papers.append(paper)
+
+            except Exception as e:
+                print(f"Error processing entry: {e}", file=sys.stderr)
+                continue
+
+    except requests.RequestException as e:
+        print(f"Error fetching papers for category {category}: {e}", file=sys.stderr)
+    except etree.XMLSyntaxError as e:
+        print(f"Error parsing feed for category {category}: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error processing papers for category {category}: {e}", file=sys.stderr)
+
+    return papers
+
 
 def get_recent_papers():
     """Downloads recent papers from Arxiv"""
@@ -42,147 +175,22 @@ def get_recent_papers():
         ],
     )
 
-    papers = []
     max_results_per_category = get_config_int(
         "max_results_per_category", config_path, 100
     )
 
-    # Format date for ArXiv API (YYYYMMDD format)
-    cutoff_date_str = cutoff_date.strftime("%Y%m%d")
-    current_date_str = datetime.now(tz=UTC).strftime("%Y%m%d")
-
+    # The Arxiv API terms allow a single connection at a time, so categories are
+    # fetched one after another over a kept-alive connection. Papers listed in
+    # several categories are kept under the first category they appear in.
+    unique_papers = {}
     for category in categories:
-        if isinstance(category, str):
-            category = category.strip()
-        else:
-            category = str(category).strip()
-
-        # Build ArXiv API query
-        # Search for papers submitted in the date range
-        query = f"cat:{category} AND submittedDate:[{cutoff_date_str}* TO {current_date_str}*]"
-
-        url = "http://export.arxiv.org/api/query"
-        params = {
-            "search_query": query,
-            "start": 0,
-            "max_results": max_results_per_category,
-            "sortBy": "submittedDate",
-            "sortOrder": "descending",
-        }
-
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            # Parse the Atom feed
-            feed = feedparser.parse(response.content)
-
-            # Check if parsing was successful
-            if hasattr(feed, "bozo") and feed.bozo:
-                print(
-                    f"Warning: Feed parsing issues for category {category}: {feed.bozo_exception}",
-                    file=sys.stderr,
-                )
-
-            if not hasattr(feed, "entries") or len(feed.entries) == 0:
-                print(f"No entries found for category {category}", file=sys.stderr)
-                continue
-
-            # print(f"Got {len(feed.entries)} entries for category {category}",file=sys.stderr)
-            for entry in feed.entries:
-                try:
-                    # Parse the submission date
-                    if not hasattr(entry, "published"):
-                        print(
-                            f"Warning: Entry missing publication date: {getattr(entry, 'title', 'Unknown')}",
-                            file=sys.stderr,
-                        )
-                        continue
-
-                    submitted_date = datetime.fromisoformat(
-                        entry.published.replace("Z", "+00:00")
-                    )
-
-                    # Double-check the date filter (API might return slightly outside range)
-                    if submitted_date < cutoff_date:
-                        continue
-
-                    # Extract authors
-                    main_author = "Unknown"
-                    authors = set()
-                    if hasattr(entry, "author"):
-                        authors.add(entry.author)
-                        main_author = entry.author
-                    if hasattr(entry, "authors"):
-                        authors.update([author.name for author in entry.authors])
-                    if main_author == "Unknown":
-                        main_author = ",".join(authors)
-                    authors = list(authors)
-
-                    # Clean up title (remove newlines and extra spaces)
-                    title = (
-                        re.sub(r"\s+", " ", entry.title.strip())
-                        if hasattr(entry, "title")
-                        else "Unknown Title"
-                    )
-
-                    # Clean up abstract
-                    abstract = (
-                        re.sub(r"\s+", " ", entry.summary.strip())
-                        if hasattr(entry, "summary")
-                        else ""
-                    )
-
-                    # Extract ArXiv ID from the link
-                    arxiv_id = entry.id.split("/")[-1] if hasattr(entry, "id") else ""
-
-                    # Get categories
-                    paper_categories = []
-                    if hasattr(entry, "tags"):
-                        paper_categories = [tag.term for tag in entry.tags]
-
-                    paper = {
-                        "title": title,
-                        "author": main_author,
-                        "all_authors": authors,
-                        "url": entry.link if hasattr(entry, "link") else entry.id,
-                        "abstract": abstract,
-                        "arxiv_id": arxiv_id,
-                        "submitted_date": submitted_date.isoformat(),
-                        "categories": paper_categories,
-                        "primary_category": category,
-                        # "full_entry": entry,
-                    }
-
-                    papers.append(paper)
-
-                except Exception as e:
-                    print(f"Error processing entry: {e}", file=sys.stderr)
-                    continue
-
-        except requests.RequestException as e:
-            print(
-                f"Error fetching papers for category {category}: {e}", file=sys.stderr
-            )
-            continue
-        except Exception as e:
-            print(
-                f"Error processing papers for category {category}: {e}", file=sys.stderr
-            )
-            continue
-
-    # Remove duplicates based on ArXiv ID
-    seen_ids = set()
-    unique_papers = []
-    for paper in papers:
-        if paper["arxiv_id"] not in seen_ids:
-            seen_ids.add(paper["arxiv_id"])
-            unique_papers.append(paper)
+        for paper in fetch_category(category, cutoff_date, max_results_per_category):
+            unique_papers.setdefault(paper["arxiv_id"], paper)
 
     # Sort by submission date (newest first)
-    unique_papers.sort(key=lambda x: x["submitted_date"], reverse=True)
-
-    return unique_papers
+    return sorted(
+        unique_papers.values(), key=lambda x: x["submitted_date"], reverse=True
+    )
 
 
 if __name__ == "__main__":
@@ -198,4 +206,6 @@ if __name__ == "__main__":
         }
         for paper in papers
     ]
-    print(json.dumps(result, indent=4))
+    sys.stdout.buffer.write(
+        orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
@@ -4,11 +4,12 @@
 # Uses the Fever API, documented here:
 # https://freshrss.github.io/FreshRSS/en/developers/06_Fever_API.html
 
-import json
+import orjson
 import requests
 from datetime import datetime, timedelta, UTC
 import itertools
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
 from pathlib import Path
 import sys
 import re
@@ -19,99 +20,116 @@ from utils.config import get_config_value, get_config_int
 
 config_path = Path("sources/freshrss/config.toml")
 
+# Words as counted for the minimum length check
+WORD_RE = re.compile(r"\b\w+\b")
+
+# Page elements that never hold the article text
+NON_CONTENT_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+
+# Elements likely to hold the article, semantic tags first, then common class names
+CONTENT_SELECTORS = (
+    "article",
+    "main",
+    '[role="main"]',
+    ".content",
+    ".post-content",
+    ".entry-content",
+    ".article-content",
+    ".main-content",
+)
+
+# Shared session so repeat requests to the same host reuse connections
+session = requests.Session()
+adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
 
 def get_date(item):
     """Get the item's creation date."""
     return datetime.fromtimestamp(item["created_on_time"], UTC)
 
 
-def filter_by_date(item):
-    """Keep items that are unread and newer than the cutoff date."""
-    lookback_days = get_config_int("lookback_days", config_path, 7)
-    cutoff_date = datetime.now(tz=UTC) - timedelta(days=lookback_days)
-    return get_date(item) > cutoff_date and item["is_read"] == 0
+def filter_by_date(item, cutoff_ts):
+    """Keep items that are unread and newer than the cutoff timestamp."""
+    # created_on_time is already a Unix timestamp, so compare it directly
+    return item["created_on_time"] > cutoff_ts and item["is_read"] == 0
+
+
+def fetch_items(fever_base_url, fever_api_key, item_ids):
+    """Fetch the full feed items for a batch of item IDs."""
+    response = session.post(
+        fever_base_url + "&items",
+        data={
+            "api_key": fever_api_key,
+            "with_ids": ",".join(item_ids),
+        },
+    )
+    return orjson.loads(response.content).get("items", [])
 
 
 def get_recent_unread_feed_items():
     fever_base_url = get_config_value("FEVER_API_BASE", config_path)
     fever_api_key = get_config_value("FEVER_API_KEY", config_path)
 
+    response = session.post(
+        fever_base_url + "&unread_item_ids",
+        data={
+            "api_key": fever_api_key,
+        },
+    )
     unread_item_ids = (
-        requests.post(
-            fever_base_url + "&unread_item_ids",
-            data={
-                "api_key": fever_api_key,
-            },
-        )
-        .json()
-        .get("unread_item_ids", "")
-        .split(",")
+        orjson.loads(response.content).get("unread_item_ids", "").split(",")
     )
 
+    # Request the batches concurrently, keeping the concurrency low since this
+    # is a single self-hosted server
     all_items = []
     batch_size = get_config_int("batch_size", config_path, 50)
-    for chunk in itertools.batched(unread_item_ids, batch_size):
-        items = (
-            requests.post(
-                fever_base_url + "&items",
-                data={
-                    "api_key": fever_api_key,
-                    "with_ids": ",".join(chunk),
-                },
-            )
-            .json()
-            .get("items", [])
+    batch_concurrency = get_config_int("batch_concurrency", config_path, 4)
+    with ThreadPoolExecutor(max_workers=max(1, batch_concurrency)) as executor:
+        batches = executor.map(
+            lambda chunk: fetch_items(fever_base_url, fever_api_key, chunk),
+            itertools.batched(unread_item_ids, batch_size),
         )
-        all_items.extend(items)
+        for items in batches:
+            all_items.extend(items)
 
-    return [i for i in all_items if filter_by_date(i)]
+    lookback_days = get_config_int("lookback_days", config_path, 7)
+    cutoff_ts = (datetime.now(tz=UTC) - timedelta(days=lookback_days)).timestamp()
+    return [i for i in all_items if filter_by_date(i, cutoff_ts)]
 
 
 def clean_html(input):
     """Strips HTML formatting and returns plain text"""
-    soup = BeautifulSoup(input, "html.parser")
-    return soup.get_text()
+    tree = LexborHTMLParser(input)
+    tree.strip_tags(["script", "style"])
+    return tree.text()
 
 
 def count_words(text):
     """Count words in text"""
-    return len(re.findall(r"\b\w+\b", text))
+    return len(WORD_RE.findall(text))
 
 
 def extract_main_content(html_content):
     """Extract main content from HTML using multiple strategies"""
-    soup = BeautifulSoup(html_content, "html.parser")
+    tree = LexborHTMLParser(html_content)
 
     # Remove unwanted elements
-    for element in soup.find_all(
-        ["script", "style", "nav", "footer", "header", "aside"]
-    ):
-        element.decompose()
-
-    # Try semantic HTML tags first
-    for tag in ["article", "main", '[role="main"]']:
-        content = soup.select_one(tag)
-        if content:
-            return content.get_text(strip=True, separator=" ")
-
-    # Try common content class names
-    for selector in [
-        ".content",
-        ".post-content",
-        ".entry-content",
-        ".article-content",
-        ".main-content",
-    ]:
-        content = soup.select_one(selector)
+    tree.strip_tags(NON_CONTENT_TAGS)
+
+    # Take the first selector that matches, in order of preference
+    for selector in CONTENT_SELECTORS:
+        content = tree.css_first(selector)
         if content:
-            return content.get_text(strip=True, separator=" ")
+            return content.text(strip=True, separator=" ")
 
     # Fall back to body content
-    body = soup.find("body")
-    if body:
-        return body.get_text(strip=True, separator=" ")
+    if tree.body:
+        return tree.body.text(strip=True, separator=" ")
 
-    return soup.get_text(strip=True, separator=" ")
+    return tree.text(strip=True, separator=" ")
 
 
 def fetch_full_content(url):
@@ -121,7 +139,7 @@ def fetch_full_content(url):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = session.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         extracted_text = extract_main_content(response.text)
         return extracted_text
@@ -134,28 +152,38 @@ def fetch_full_content(url):
 if __name__ == "__main__":
     feed_items = get_recent_unread_feed_items()
     min_word_count = get_config_int("min_word_count", config_path, 50)
+    fetch_concurrency = get_config_int("fetch_concurrency", config_path, 16)
 
-    result = []
+    # Clean every item, noting the ones that are too short to evaluate
+    short_items = []
     for item in feed_items:
-        cleaned_content = clean_html(item["html"])
-
-        # Check if content is too short and fetch full page if needed
-        if count_words(cleaned_content) < min_word_count and item.get("url"):
+        item["html"] = clean_html(item["html"])
+        word_count = count_words(item["html"])
+        if word_count < min_word_count and item.get("url"):
             print(
-                f"Content too short ({count_words(cleaned_content)} words), fetching full page: {item['url']}",
+                f"Content too short ({word_count} words), fetching full page: {item['url']}",
                 file=sys.stderr,
             )
-            full_content = fetch_full_content(item["url"])
-            if full_content and count_words(full_content) > count_words(
-                cleaned_content
-            ):
-                cleaned_content = full_content
+            short_items.append((item, word_count))
+
+    # Fetch full pages for the short items concurrently
+    with ThreadPoolExecutor(max_workers=max(1, fetch_concurrency)) as executor:
+        full_contents = executor.map(
+            fetch_full_content, [item["url"] for item, _ in short_items]
+        )
+        for (item, word_count), full_content in zip(short_items, full_contents):
+            if not full_content:
+                continue
+            full_word_count = count_words(full_content)
+            if full_word_count > word_count:
+                item["html"] = full_content
                 print(
-                    f"Successfully fetched full content ({count_words(full_content)} words)",
+                    f"Successfully fetched full content ({full_word_count} words)",
                     file=sys.stderr,
                 )
 
-        item["html"] = cleaned_content
+    result = []
+    for item in feed_items:
         result.append(
             {
                 "source": "FreshRSS",
@@ -165,4 +193,6 @@ if __name__ == "__main__":
                 "input": item,
             }
         )
-    print(json.dumps(result, indent=4))
+    sys.stdout.buffer.write(
+        orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
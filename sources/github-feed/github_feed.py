@@ -2,13 +2,15 @@
 # Looks for repos that the user hasn't starred and fetches their README
 # Formats the output correctly and prints to stdout
 
-import json
+import orjson
 import requests
 import base64
+import itertools
 from datetime import datetime, timedelta, UTC
 import sys
 from pathlib import Path
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import utils
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -16,6 +18,15 @@ from utils.config import get_config_value, get_config_int
 
 config_path = Path("sources/github-feed/config.toml")
 
+# Shared session so repeat requests to the same host reuse connections, with
+# enough pooled connections for the concurrent fetches below
+session = requests.Session()
+adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+session.mount("https://", adapter)
+
+# Longest Retry-After we'll sleep through before retrying, in seconds
+MAX_RETRY_AFTER = 60
+
 
 def get_github_headers(token):
     """Get headers for GitHub API requests"""
@@ -29,7 +40,23 @@ def get_github_headers(token):
 def make_github_request(url, headers, params=None):
     """Make a GitHub API request with error handling and rate limiting"""
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = session.get(url, headers=headers, params=params, timeout=30)
+
+        # Secondary rate limits ask us to back off for a while, then retry once.
+        # Longer or unreadable waits fall through to the error handling below.
+        retry_after = response.headers.get("Retry-After", "")
+        if (
+            response.status_code in (403, 429)
+            and retry_after.isdigit()
+            and int(retry_after) <= MAX_RETRY_AFTER
+        ):
+            wait_time = int(retry_after)
+            print(
+                f"Secondary rate limit hit, retrying in {wait_time} seconds",
+                file=sys.stderr,
+            )
+            time.sleep(wait_time)
+            response = session.get(url, headers=headers, params=params, timeout=30)
 
         # Check rate limiting
         if response.status_code == 403 and "X-RateLimit-Remaining" in response.headers:
@@ -44,48 +71,43 @@ def make_github_request(url, headers, params=None):
                 sys.exit(1)
 
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except requests.RequestException as e:
         print(f"Error making GitHub API request to {url}: {e}", file=sys.stderr)
         return None
+    except orjson.JSONDecodeError as e:
+        print(f"Error parsing GitHub API response from {url}: {e}", file=sys.stderr)
+        return None
 
 
-def get_user_starred_repos(token, username):
-    """Get list of repositories the user has starred"""
-    headers = get_github_headers(token)
-    starred_repos = set()
-    page = 1
-
-    while True:
-        url = f"https://api.github.com/users/{username}/starred"
-        params = {"page": page, "per_page": 100}
-
-        data = make_github_request(url, headers, params)
-        if not data:
-            break
-
-        if not data:  # Empty response means no more pages
-            break
-
-        for repo in data:
-            starred_repos.add(repo["full_name"])
+def is_repo_starred(token, repo_full_name):
+    """Check whether the authenticated user has starred a repository
 
-        # If we got less than 100 results, we're done
-        if len(data) < 100:
-            break
+    Returns None if the check failed, so the caller can skip the repo rather
+    than mistake it for unstarred.
+    """
+    headers = get_github_headers(token)
+    url = f"https://api.github.com/user/starred/{repo_full_name}"
 
-        page += 1
+    try:
+        response = session.get(url, headers=headers, timeout=30)
+    except requests.RequestException as e:
+        print(f"Error checking star status of {repo_full_name}: {e}", file=sys.stderr)
+        return None
 
-        # Safety limit to prevent infinite loops
-        if page > 100:
-            print(
-                "Warning: Hit safety limit for starred repos pagination",
-                file=sys.stderr,
-            )
-            break
+    # 204 means starred, 404 means not starred
+    if response.status_code == 204:
+        return True
+    if response.status_code == 404:
+        return False
 
-    print(f"Found {len(starred_repos)} starred repositories", file=sys.stderr)
-    return starred_repos
+    # Anything else (bad token, rate limit, server error) tells us nothing
+    print(
+        f"Warning: could not check star status of {repo_full_name}: "
+        f"HTTP {response.status_code}, skipping",
+        file=sys.stderr,
+    )
+    return None
 
 
 def get_trending_repos(token, lookback_days=7, min_stars=10):
@@ -121,39 +143,49 @@ def get_following_activity(token, username, lookback_days=7):
     # Limit to prevent too many API calls
     following_users = following_data[:20]  # Limit to first 20 following users
 
-    interesting_repos = []
-
-    for user in following_users:
-        # Get recent events for this user
-        events_url = f"https://api.github.com/users/{user['login']}/events"
-        events_data = make_github_request(events_url, headers)
-
-        if not events_data:
-            continue
-
-        for event in events_data:
-            # Only look at star events (WatchEvent) and fork events
-            if event.get("type") not in ["WatchEvent", "ForkEvent"]:
+    # Get recent events for each user
+    request_concurrency = max(1, get_config_int("request_concurrency", config_path, 4))
+    with ThreadPoolExecutor(max_workers=request_concurrency) as executor:
+        users_events = executor.map(
+            lambda user: make_github_request(
+                f"https://api.github.com/users/{user['login']}/events", headers
+            ),
+            following_users,
+        )
+
+        # Collect the repos that were recently starred or forked, in event order
+        repo_names = {}
+        for events_data in users_events:
+            if not events_data:
                 continue
 
-            # Check if event is recent
-            event_date = datetime.fromisoformat(
-                event["created_at"].replace("Z", "+00:00")
-            )
-            if event_date < cutoff_date:
-                continue
+            for event in events_data:
+                # Only look at star events (WatchEvent) and fork events
+                if event.get("type") not in ["WatchEvent", "ForkEvent"]:
+                    continue
 
-            # Extract repository information
-            repo_data = event.get("repo")
-            if not repo_data:
-                continue
+                # Check if event is recent
+                event_date = datetime.fromisoformat(
+                    event["created_at"].replace("Z", "+00:00")
+                )
+                if event_date < cutoff_date:
+                    continue
 
-            # Get full repository details
-            repo_url = f"https://api.github.com/repos/{repo_data['name']}"
-            repo_details = make_github_request(repo_url, headers)
+                # Extract repository information
+                repo_data = event.get("repo")
+                if not repo_data:
+                    continue
 
-            if repo_details:
-                interesting_repos.append(repo_details)
+                repo_names[repo_data["name"]] = None
+
+        # Get full repository details, once per repository
+        repos_details = executor.map(
+            lambda name: make_github_request(
+                f"https://api.github.com/repos/{name}", headers
+            ),
+            repo_names,
+        )
+        interesting_repos = [details for details in repos_details if details]
 
     return interesting_repos
 
@@ -207,9 +239,6 @@ def get_recent_feed_items():
 
     print(f"Fetching GitHub feed for user: {username}", file=sys.stderr)
 
-    # Get user's starred repositories to filter them out
-    starred_repos = get_user_starred_repos(token, username)
-
     # Get trending repositories
     print("Fetching trending repositories...", file=sys.stderr)
     trending_repos = get_trending_repos(token, lookback_days, min_stars)
@@ -218,58 +247,66 @@ def get_recent_feed_items():
     print("Fetching activity from followed users...", file=sys.stderr)
     following_activity = get_following_activity(token, username, lookback_days)
 
-    # Combine and deduplicate repositories
-    all_repos = {}
-
-    # Add trending repos
-    for repo in trending_repos:
-        if repo["full_name"] not in starred_repos:
-            all_repos[repo["full_name"]] = repo
-
-    # Add repos from following activity
-    for repo in following_activity:
-        if repo["full_name"] not in starred_repos:
-            all_repos[repo["full_name"]] = repo
+    # Combine and deduplicate repositories, trending first
+    all_repos = {
+        repo["full_name"]: repo
+        for repo in itertools.chain(trending_repos, following_activity)
+    }
 
-    # Limit the number of repos to process
-    repo_list = list(all_repos.values())[:max_repos]
+    # Filter out repos the user has already starred. Rather than paging through
+    # the user's whole starred history, ask about each candidate, one batch at
+    # a time, until we have enough repos to process
+    request_concurrency = max(1, get_config_int("request_concurrency", config_path, 4))
+    candidates = iter(all_repos.values())
+    repo_list = []
+    with ThreadPoolExecutor(max_workers=request_concurrency) as executor:
+        while len(repo_list) < max_repos:
+            batch = list(itertools.islice(candidates, max_repos - len(repo_list)))
+            if not batch:
+                break
+
+            starred = executor.map(
+                lambda repo: is_repo_starred(token, repo["full_name"]), batch
+            )
+            repo_list.extend(
+                repo for repo, is_starred in zip(batch, starred) if is_starred is False
+            )
 
     print(f"Processing {len(repo_list)} unstarred repositories...", file=sys.stderr)
 
     # Get README content for each repository
-    results = []
-    for repo in repo_list:
-        try:
-            print(f"Processing {repo['full_name']}...", file=sys.stderr)
-
-            # Get README content
-            readme_content = get_readme_content(token, repo["full_name"])
-
-            # Add README to repo data
-            repo_data = repo.copy()
-            repo_data["readme_content"] = readme_content
-
-            # Create the result item
-            result_item = {
-                "source": "GitHub Feed",
-                "title": f"{repo['name']} - {repo.get('description', 'No description')}",
-                "link": repo["html_url"],
-                # creation date isn't what we're interested in here, so we use the scrape date instead
-                "creation_date": datetime.now(tz=UTC).isoformat(),
-                "input": repo_data,
-            }
-
-            results.append(result_item)
-
-            # Small delay to be respectful to the API
-            time.sleep(0.1)
-
-        except Exception as e:
-            print(
-                f"Error processing repository {repo.get('full_name', 'unknown')}: {e}",
-                file=sys.stderr,
-            )
-            continue
+    with ThreadPoolExecutor(max_workers=request_concurrency) as executor:
+        readmes = executor.map(
+            lambda repo: get_readme_content(token, repo["full_name"]), repo_list
+        )
+
+        results = []
+        for repo, readme_content in zip(repo_list, readmes):
+            try:
+                print(f"Processing {repo['full_name']}...", file=sys.stderr)
+
+                # Add README to repo data
+                repo_data = repo.copy()
+                repo_data["readme_content"] = readme_content
+
+                # Create the result item
+                result_item = {
+                    "source": "GitHub Feed",
+                    "title": f"{repo['name']} - {repo.get('description', 'No description')}",
+                    "link": repo["html_url"],
+                    # creation date isn't what we're interested in here, so we use the scrape date instead
+                    "creation_date": datetime.now(tz=UTC).isoformat(),
+                    "input": repo_data,
+                }
+
+                results.append(result_item)
+
+            except Exception as e:
+                print(
+                    f"Error processing repository {repo.get('full_name', 'unknown')}: {e}",
+                    file=sys.stderr,
+                )
+                continue
 
     return results
 
@@ -277,7 +314,11 @@ def get_recent_feed_items():
 if __name__ == "__main__":
     try:
         feed_items = get_recent_feed_items()
-        print(json.dumps(feed_items, indent=4))
+        sys.stdout.buffer.write(
+            orjson.dumps(
+                feed_items, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+            )
+        )
     except KeyboardInterrupt:
         print("Interrupted by user", file=sys.stderr)
         sys.exit(1)
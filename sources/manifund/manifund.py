@@ -5,8 +5,11 @@
 # Uses the Manifund API, documented here:
 # https://manifund.org/docs
 
-import json
+import orjson
 import requests
+from urllib3.util import Retry
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
 from pathlib import Path
 import sys
@@ -17,19 +20,23 @@ from utils.config import get_config_int
 
 config_path = Path("sources/manifund/config.toml")
 
+# Shared session so repeat requests to the same host reuse connections, with
+# a few retries for transient server errors mid-pagination
+session = requests.Session()
+adapter = requests.adapters.HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+    ),
+)
+session.mount("https://", adapter)
+
 
 def get_date(item):
     """Get the item's creation date."""
-    return datetime.strptime(item["created_at"], "%Y-%m-%dT%H:%M:%S.%fZ").replace(
-        tzinfo=UTC
-    )
-
-
-def filter_by_date(item):
-    lookback_days = get_config_int("lookback_days", config_path, 7)
-    cutoff_date = datetime.now(tz=UTC) - timedelta(days=lookback_days)
-    item_date = get_date(item)
-    return item_date > cutoff_date
+    # Timestamps end in Z, which fromisoformat reads as UTC since Python 3.11
+    return datetime.fromisoformat(item["created_at"])
 
 
 # Generic function to get recent items from Manifund API
@@ -58,9 +65,9 @@ def get_recent_items(endpoint):
         if before_param:
             url += f"?before={before_param}"
 
-        response = requests.get(url)
+        response = session.get(url, timeout=30)
         response.raise_for_status()
-        batch_items = response.json()
+        batch_items = orjson.loads(response.content)
 
         # If no items returned, we're done
         if not batch_items:
@@ -71,23 +78,17 @@ def get_recent_items(endpoint):
         if items_processed > max_projects:
             break
 
-        # Filter items to only include those within our date range
-        filtered_items = []
-        oldest_item_date = None
-
+        # Items come newest first (which the before= pagination relies on), so
+        # keep them until the first one older than our cutoff
+        reached_cutoff = False
         for item in batch_items:
-            if filter_by_date(item):
-                filtered_items.append(item)
-            # Track the oldest item date for pagination
-            item_date = get_date(item)
-            if oldest_item_date is None or item_date < oldest_item_date:
-                oldest_item_date = item_date
-
-        recent_items.extend(filtered_items)
-
-        # If the oldest item in this batch is older than our cutoff,
-        # we've gotten all items we need
-        if oldest_item_date and oldest_item_date <= cutoff_date:
+            if get_date(item) <= cutoff_date:
+                reached_cutoff = True
+                break
+            recent_items.append(item)
+
+        # Once we pass the cutoff we've gotten all items we need
+        if reached_cutoff:
             break
 
         # Set up next pagination using the oldest item's created_at
@@ -98,21 +99,23 @@ def get_recent_items(endpoint):
 
 def link_comments(projects, comments):
     """Add relevant comments to each project."""
-    for project in projects:
-        project["comments"] = [
+    # Index comments by project once rather than scanning them all per project
+    comments_by_slug = defaultdict(list)
+    for c in comments:
+        comments_by_slug[c["projects"]["slug"]].append(
             f"{c['profiles']['full_name']} says: {c['content']}"
-            for c in comments
-            if c["projects"]["slug"] == project["slug"]
-        ]
+        )
+
+    for project in projects:
         # Reverse to show oldest comments first
-        project["comments"].reverse()
+        project["comments"] = comments_by_slug.get(project["slug"], [])[::-1]
     return projects
 
 
 if __name__ == "__main__":
-    # Fetch recent projects and comments
-    projects = get_recent_items("projects")
-    comments = get_recent_items("comments")
+    # Fetch recent projects and comments, walking both endpoints at once
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        projects, comments = executor.map(get_recent_items, ["projects", "comments"])
 
     # Link comments to their respective projects
     projects = link_comments(projects, comments)
@@ -129,4 +132,6 @@ if __name__ == "__main__":
         for project in projects
     ]
 
-    print(json.dumps(result, indent=4))
+    sys.stdout.buffer.write(
+        orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
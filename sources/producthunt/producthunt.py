@@ -4,8 +4,9 @@
 # Uses the ProductHunt GraphQL API v2
 # Documentation: https://api.producthunt.com/v2/docs
 
-import json
+import orjson
 import requests
+from urllib3.util import Retry
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, UTC
 import sys
@@ -17,17 +18,25 @@ from utils.config import get_config_value, get_config_int
 
 config_path = Path("sources/producthunt/config.toml")
 
+# Shared session so repeat requests to the same host reuse connections, with
+# a few retries for transient server errors mid-pagination. GraphQL queries are
+# read-only, so retrying the POST is safe.
+session = requests.Session()
+adapter = requests.adapters.HTTPAdapter(
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+)
+session.mount("https://", adapter)
+
 
 def get_date(item):
     """Extract the creation date from a ProductHunt post."""
-    return datetime.fromisoformat(item["createdAt"].replace("Z", "+00:00"))
-
-
-def filter_by_date(item):
-    """Keep items that are newer than the cutoff date."""
-    lookback_days = get_config_int("lookback_days", config_path, 7)
-    cutoff_date = datetime.now(tz=UTC) - timedelta(days=lookback_days)
-    return get_date(item) > cutoff_date
+    # Timestamps end in Z, which fromisoformat reads as UTC since Python 3.11
+    return datetime.fromisoformat(item["createdAt"])
 
 
 def get_recent_posts():
@@ -49,6 +58,9 @@ def get_recent_posts():
         "Host": "api.producthunt.com",
     }
 
+    # Let the API drop posts older than the cutoff rather than paging past them
+    posted_after = cutoff_date.isoformat()
+
     posts = []
     after_cursor = None
     max_pages = 20  # Safety limit to prevent infinite loops
@@ -61,7 +73,7 @@ def get_recent_posts():
         query = {
             "query": f"""
             query getRecentPosts {{
-                posts(first: 50, order: NEWEST{cursor_param}) {{
+                posts(first: 50, order: NEWEST, postedAfter: "{posted_after}"{cursor_param}) {{
                     edges {{
                         node {{
                             id
@@ -88,10 +100,10 @@ def get_recent_posts():
         }
 
         try:
-            response = requests.post(url, headers=headers, json=query, timeout=30)
+            response = session.post(url, headers=headers, json=query, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Check for GraphQL errors
             if "errors" in data:
@@ -125,7 +137,10 @@ def get_recent_posts():
                         oldest_post_date = post_date
 
                     # Only include posts within our date range and minimum vote threshold
-                    if filter_by_date(post) and post.get("votesCount", 0) >= min_votes:
+                    if (
+                        post_date > cutoff_date
+                        and post.get("votesCount", 0) >= min_votes
+                    ):
                         # Clean up the post data with minimal fields
                         cleaned_post = {
                             "id": post["id"],
@@ -193,4 +208,6 @@ if __name__ == "__main__":
         }
         for post in posts
     ]
-    print(json.dumps(result, indent=4))
+    sys.stdout.buffer.write(
+        orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
@@ -1,43 +1,45 @@
 #!/usr/bin/env python3
 
 import matplotlib
+
+matplotlib.use("Agg")  # Use non-interactive backend, before pyplot loads
+
 import matplotlib.pyplot as plt
 import base64
 import io
-from collections import defaultdict
+import numpy as np
 from typing import Dict, List
 
-matplotlib.use("Agg")  # Use non-interactive backend
-
 
 def aggregate_data(digest_results):
-    """Extract and process items from digest results."""
-    all_items = []
-
-    for item in digest_results:
-        # Skip those without evals
-        if item["weighted_score"] is None:
-            continue
+    """Extract evaluated items with their eval scores as NumPy arrays."""
+    # Skip those without evals
+    evaluated = [item for item in digest_results if item["weighted_score"] is not None]
+    weighted_scores = np.array([item["weighted_score"] for item in evaluated])
 
-        evals = [
+    all_items = []
+    for idx in np.argsort(weighted_scores, kind="stable"):
+        item = evaluated[idx]
+        evals = item["evals"]
+        all_items.append(
             {
-                "prompt_hash": e["prompt_hash"],
-                "model": e["model"],
-                "score": e["response"]["importance_score"],
-                "confidence": e["response"]["confidence_score"],
+                "source": item["source"],
+                "title": item["title"],
+                "dedup_key": item["dedup_key"],
+                "weighted_score": item["weighted_score"],
+                "scores": np.fromiter(
+                    (e["response"]["importance_score"] for e in evals),
+                    dtype=float,
+                    count=len(evals),
+                ),
+                "confidences": np.fromiter(
+                    (e["response"]["confidence_score"] for e in evals),
+                    dtype=float,
+                    count=len(evals),
+                ),
             }
-            for e in item["evals"]
-        ]
-        item_data = {
-            "source": item["source"],
-            "title": item["title"],
-            "dedup_key": item["dedup_key"],
-            "weighted_score": item["weighted_score"],
-            "evals": evals,
-        }
-        all_items.append(item_data)
-
-    all_items.sort(key=lambda x: x["weighted_score"])
+        )
+
     return all_items
 
 
@@ -45,10 +47,9 @@ def plot_to_base64(fig):
     """Convert matplotlib figure to base64 string."""
     img_buffer = io.BytesIO()
     fig.savefig(img_buffer, format="png", dpi=150, bbox_inches="tight")
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
     plt.close(fig)
-    return img_str
+    # Encode from a view of the buffer rather than a copy of its bytes
+    return base64.b64encode(img_buffer.getbuffer()).decode("ascii")
 
 
 def create_importance_eventplot(all_items, max_items_to_show=50, max_title_len=50):
@@ -62,7 +63,7 @@ def create_importance_eventplot(all_items, max_items_to_show=50, max_title_len=5
             else item["title"]
         )
         titles.append(f"{item['source']}: {short_title}")
-        importance_scores_lists.append([e["score"] for e in item["evals"]])
+        importance_scores_lists.append(item["scores"])
         weighted_scores.append(item["weighted_score"])
 
     y_positions = range(len(titles))
@@ -92,20 +93,24 @@ def create_importance_eventplot(all_items, max_items_to_show=50, max_title_len=5
 def create_scatter_plot(all_items):
     """Create scatter plot of scores vs confidence by source."""
     print("Generating scatter plot of scores...")
-    scores_by_source = defaultdict(list)
-    confidences_by_source = defaultdict(list)
-
-    for item in all_items:
-        for e in item["evals"]:
-            scores_by_source[item["source"]].append(e["score"])
-            confidences_by_source[item["source"]].append(e["confidence"])
+    if all_items:
+        scores = np.concatenate([item["scores"] for item in all_items])
+        confidences = np.concatenate([item["confidences"] for item in all_items])
+        sources = np.repeat(
+            [item["source"] for item in all_items],
+            [len(item["scores"]) for item in all_items],
+        )
+    else:
+        scores = confidences = sources = np.array([])
 
     fig, ax = plt.subplots(figsize=(10, 8))
     colormap = plt.get_cmap("tab10")
-    for i, source in enumerate(scores_by_source):
+    # Keep sources in order of first appearance so colors and legend are stable
+    for i, source in enumerate(dict.fromkeys(sources)):
+        mask = sources == source
         ax.scatter(
-            scores_by_source[source],
-            confidences_by_source[source],
+            scores[mask],
+            confidences[mask],
             alpha=0.3,
             s=40,
             label=source,
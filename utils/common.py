@@ -7,15 +7,70 @@ API calls, and other common tasks used across the digest system.
 """
 
 import json
+import mmap
+import os
+import random
 import sys
 import time
 import hashlib
+import orjson
 import requests
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from utils.config import get_config_value, get_config_int
 
+# Shared HTTP session so repeated Ollama calls reuse pooled keep-alive connections
+_ollama_session = requests.Session()
+_ollama_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=16, pool_maxsize=16, max_retries=0
+)
+_ollama_session.mount("http://", _ollama_adapter)
+_ollama_session.mount("https://", _ollama_adapter)
+
+# Seconds allowed to open a connection to Ollama
+OLLAMA_CONNECT_TIMEOUT = 5
+
+# Longest backoff between Ollama retries, in seconds
+MAX_RETRY_DELAY = 30
+
+# Statuses that signal a busy or restarting server rather than a bad request
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Transport failures worth retrying, including a connection dropped mid-response
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# JSON schema for evaluation responses, matching the format in prompt_instructions.
+# Ollama constrains generation to it, so replies parse and validate first try.
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scratchpad": {"type": "string"},
+        "summary": {"type": "string"},
+        "evaluation": {"type": "string"},
+        "importance_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "confidence_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "followup": {"type": "string"},
+    },
+    "required": [
+        "scratchpad",
+        "summary",
+        "evaluation",
+        "importance_score",
+        "confidence_score",
+        "followup",
+    ],
+}
+
+# Fields every stored evaluation must have, whether or not the schema was honored
+REQUIRED_RESPONSE_KEYS = frozenset(
+    {"summary", "evaluation", "importance_score", "confidence_score"}
+)
+
 
 def load_json_file(file_path: str) -> List[Dict[str, Any]]:
     """
@@ -31,28 +86,42 @@ def load_json_file(file_path: str) -> List[Dict[str, Any]]:
         FileNotFoundError: If the file doesn't exist
         json.JSONDecodeError: If the file contains invalid JSON
     """
-    path = Path(file_path)
-    if not path.exists():
+    try:
+        f = open(file_path, "rb")
+    except FileNotFoundError:
         raise FileNotFoundError(f"JSON file not found: {file_path}")
 
-    with open(path, "r") as f:
-        data = json.load(f)
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files, so let orjson reject it as invalid JSON
+            data = orjson.loads(b"")
+        else:
+            # Parse straight from the page cache without copying into a str
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
 
     # Ensure we return a list for consistency
     return data if isinstance(data, list) else [data]
 
 
-def save_json_file(data: List[Dict[str, Any]], file_path: str, indent: int = 2) -> None:
+def save_json_file(data: List[Dict[str, Any]], file_path: str, indent: int = 0) -> None:
     """
     Save data to a JSON file.
 
+    The data is written to a temporary file and renamed into place, so readers
+    never see a partially written file.
+
     Args:
         data: Data to save
         file_path: Path where to save the file
-        indent: JSON indentation level
+        indent: JSON indentation level (0 for compact output, or 2 for readability)
     """
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=indent)
+    option = orjson.OPT_INDENT_2 if indent else 0
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=option))
+    os.replace(tmp_path, file_path)
 
 
 def load_json_file_safe(file_path: str) -> List[Dict[str, Any]]:
@@ -94,78 +163,85 @@ def call_ollama(item: Dict[str, Any], prompt: str) -> Dict[str, Any]:
         "OLLAMA_BASE_URL", config_path, "http://localhost:11434"
     )
     ollama_model = get_config_value("eval_model", config_path, "llama3.2")
-    max_retries = get_config_int("eval_model", config_path, 3)
-    timeout = 120
+    max_retries = get_config_int("eval_retries", config_path, 3)
+    read_timeout = get_config_int("eval_timeout", config_path, 120)
+    num_ctx = get_config_int("eval_num_ctx", config_path, 8192)
+    num_predict = get_config_int("eval_num_predict", config_path, 4096)
+    keep_alive = get_config_value("eval_keep_alive", config_path, "30m")
+
+    # Rough token estimate; Ollama silently drops the start of an oversized prompt
+    prompt_tokens = len(prompt) // 4
+    if prompt_tokens > num_ctx - num_predict:
+        print(
+            f"Warning: prompt is ~{prompt_tokens} tokens, which may not fit in "
+            f"num_ctx={num_ctx} with num_predict={num_predict}",
+            file=sys.stderr,
+        )
 
-    # Initialize the eval data
+    # Initialize the eval data, keeping only a hash of the prompt since the
+    # full text can be rebuilt from the item and its config
     eval_data = {
         "model": ollama_model,
-        "prompt": prompt,
         "prompt_hash": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
         "eval_date": get_current_timestamp(),
     }
 
-    # Set the reuired keys
-    required_keys = {"summary", "evaluation", "importance_score", "confidence_score"}
-
     for attempt in range(max_retries):
         try:
-            response = requests.post(
+            response = _ollama_session.post(
                 f"{ollama_base_url}/api/generate",
                 json={
                     "model": ollama_model,
                     "prompt": prompt,
-                    "format": "json",
+                    "format": RESPONSE_SCHEMA,
                     "stream": False,
+                    "keep_alive": keep_alive,
+                    "options": {"num_ctx": num_ctx, "num_predict": num_predict},
                 },
-                timeout=timeout,
+                timeout=(OLLAMA_CONNECT_TIMEOUT, read_timeout),
             )
-            response.raise_for_status()
-            response_text = response.json().get("response")
-            response_json = json.loads(response_text)
-
-            # Check if response has all required keys
-            if isinstance(response_json, dict) and required_keys.issubset(
-                response_json.keys()
-            ):
-                if not isinstance(response_json["importance_score"], int):
-                    print(
-                        f"Attempt {attempt + 1}: Importance score ({response_json['importance_score']}) should be a number",
-                        file=sys.stderr,
-                    )
-                    continue
-                if not isinstance(response_json["confidence_score"], int):
-                    print(
-                        f"Attempt {attempt + 1}: Confidence score ({response_json['confidence_score']}) should be a number",
-                        file=sys.stderr,
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                print(
+                    f"Attempt {attempt + 1}: Ollama returned {response.status_code}",
+                    file=sys.stderr,
+                )
+                if attempt == max_retries - 1:
+                    raise RuntimeError(
+                        f"Ollama still unavailable after {max_retries} attempts: {response.status_code}"
                     )
-                    continue
+                time.sleep(retry_delay(attempt, response))
+                continue
+            response.raise_for_status()
+            response_text = orjson.loads(response.content).get("response")
+            response_json = orjson.loads(response_text)
 
-                # All keys are present and numbers are numbers
+            # Check the response in case the model ignored the schema
+            errors = validate_response(response_json)
+            if not errors:
                 eval_data["response"] = response_json
                 return eval_data
-            else:
-                missing_keys = required_keys - set(
-                    response_json.keys() if isinstance(response_json, dict) else []
-                )
+
+            print(
+                f"Attempt {attempt + 1}: Invalid response: {'; '.join(errors)}",
+                file=sys.stderr,
+            )
+            if attempt == max_retries - 1:
                 print(
-                    f"Attempt {attempt + 1}: Missing required keys in response: {missing_keys}",
+                    f"Failed to get valid response after {max_retries} attempts",
                     file=sys.stderr,
                 )
-                if attempt == max_retries - 1:
-                    print(
-                        f"Failed to get valid response after {max_retries} attempts",
-                        file=sys.stderr,
-                    )
-                    raise ValueError("Failed to get valid response from ollama")
+                raise ValueError("Failed to get valid response from ollama")
 
-        except requests.exceptions.RequestException as e:
+        except requests.exceptions.HTTPError as e:
+            # Any other error status means the request itself is wrong
+            raise RuntimeError(f"Ollama rejected the request: {str(e)}")
+        except RETRYABLE_EXCEPTIONS as e:
             print(f"Attempt {attempt + 1}: Error calling ollama: {e}", file=sys.stderr)
-            time.sleep(1)
             if attempt == max_retries - 1:
                 raise RuntimeError(
                     f"Failed to get response from ollama after {max_retries} attempts: {str(e)}"
                 )
+            time.sleep(retry_delay(attempt))
         except json.JSONDecodeError as e:
             print(
                 f"Attempt {attempt + 1}: Error parsing JSON response: {e}",
@@ -179,6 +255,52 @@ def call_ollama(item: Dict[str, Any], prompt: str) -> Dict[str, Any]:
     raise RuntimeError("Unexpected error in call_ollama")
 
 
+def validate_response(response_json: Any) -> List[str]:
+    """
+    Check a parsed evaluation response against the fields evaluations rely on.
+
+    Args:
+        response_json: Parsed JSON returned by the model
+
+    Returns:
+        List of problems found, empty if the response is usable
+    """
+    if not isinstance(response_json, dict):
+        return ["Response is not a JSON object"]
+
+    missing_keys = REQUIRED_RESPONSE_KEYS - response_json.keys()
+    if missing_keys:
+        return [f"Missing required keys in response: {missing_keys}"]
+
+    errors = []
+    for key in ("importance_score", "confidence_score"):
+        value = response_json[key]
+        if not isinstance(value, int) or isinstance(value, bool):
+            errors.append(f"{key} ({value}) should be a whole number")
+        elif not 0 <= value <= 100:
+            errors.append(f"{key} ({value}) should be between 0 and 100")
+    return errors
+
+
+def retry_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """
+    Get how long to wait before retrying a failed request.
+
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        response: The failed response, checked for a Retry-After header
+
+    Returns:
+        Delay in seconds, doubling with each attempt up to a cap, plus jitter so
+        concurrent workers don't retry in lockstep
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+    return min(2 ** (attempt + 1) + random.random(), MAX_RETRY_DELAY)
+
+
 def get_dedup_key(item: Dict[str, Any]) -> str:
     """
     Generate a deduplication key for an item.
@@ -187,10 +309,13 @@ def get_dedup_key(item: Dict[str, Any]) -> str:
         item: Item dictionary containing 'source' and 'link' keys
 
     Returns:
-        MD5 hash of the deduplication string
+        BLAKE2b-128 hash of the source and link
     """
-    dedup_string = f"{item['source']}|{item['link']}"
-    return hashlib.md5(dedup_string.encode("utf-8")).hexdigest()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(item["source"].encode("utf-8"))
+    h.update(b"|")
+    h.update(item["link"].encode("utf-8"))
+    return h.hexdigest()
 
 
 def get_current_timestamp() -> str:
@@ -229,35 +354,38 @@ def run_subprocess_with_json_output(
 
     Raises:
         subprocess.CalledProcessError: If the command fails
-        json.JSONDecodeError: If the output is not valid JSON
+        orjson.JSONDecodeError: If the output is not valid JSON
     """
     import subprocess
 
     try:
+        # Keep stdout as bytes so orjson can parse it without a decode step
         result = subprocess.run(
             command,
             capture_output=True,
-            text=True,
             check=True,
             cwd=cwd,
         )
 
         # Pass through stderr
-        for line in result.stderr.splitlines():
+        for line in result.stderr.decode("utf-8", errors="replace").splitlines():
             if line.strip():
                 print(line, file=sys.stderr)
 
         # Parse JSON output from stdout
-        data = json.loads(result.stdout)
+        data = orjson.loads(result.stdout)
         return data if isinstance(data, list) else [data]
 
     except subprocess.CalledProcessError as e:
         print(f"Error running command {' '.join(command)}: {e}", file=sys.stderr)
-        print(f"stderr: {e.stderr}", file=sys.stderr)
+        print(f"stderr: {e.stderr.decode('utf-8', errors='replace')}", file=sys.stderr)
         raise
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(
             f"Error parsing JSON from command {' '.join(command)}: {e}", file=sys.stderr
         )
-        print(f"stdout: {result.stdout}", file=sys.stderr)
+        print(
+            f"stdout: {result.stdout.decode('utf-8', errors='replace')}",
+            file=sys.stderr,
+        )
         raise
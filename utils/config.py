@@ -7,21 +7,45 @@ with fallback to base configuration and environment variables for secrets.
 """
 
 import os
-import toml
+import tomllib
 from dotenv import load_dotenv
+from functools import cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+# Parsed TOML files keyed by path, each stored with the mtime it was read at
+_toml_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def load_toml_cached(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file, reusing the parsed result until the file changes"""
+    mtime = path.stat().st_mtime
+    cached = _toml_cache.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    _toml_cache[str(path)] = (mtime, data)
+    return data
+
+
+@cache
+def load_env_file() -> bool:
+    """Load the .env file into the environment, once per process"""
+    # load_dotenv never overrides variables already set, so reading the file
+    # again on later lookups could only ever re-apply the same values
+    return load_dotenv()
 
 
 def load_base_config() -> Dict[str, Any]:
     """Load base configuration from sources/base.toml"""
     base_config_path = Path("sources/base.toml")
-    if not base_config_path.exists():
+    try:
+        return load_toml_cached(base_config_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Base config file not found: {base_config_path}")
 
-    with open(base_config_path, "r") as f:
-        return toml.load(f)
-
 
 def load_source_config(config_path) -> Dict[str, Any]:
     """Load a source's config.toml file"""
@@ -32,11 +56,24 @@ def load_source_config(config_path) -> Dict[str, Any]:
     if isinstance(config_path, str):
         config_path = Path(config_path)
 
-    if not config_path.exists():
+    try:
+        return load_toml_cached(config_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Source config file not found: {config_path}")
 
-    with open(config_path, "r") as f:
-        return toml.load(f)
+
+def get_config_signature(config_path) -> Tuple[Any, ...]:
+    """
+    Get a value that changes whenever a source's config or the base config does.
+    Useful as a cache key for anything derived from the merged configuration.
+    """
+    signature = [str(config_path)]
+    for path in (Path(config_path), Path("sources/base.toml")):
+        try:
+            signature.append(path.stat().st_mtime)
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
 
 
 def get_config_value(key: str, config_path, default: Any = None) -> Any:
@@ -48,7 +85,7 @@ def get_config_value(key: str, config_path, default: Any = None) -> Any:
     4. Default value
     """
     # Always check environment first for secrets
-    load_dotenv()
+    load_env_file()
     env_value = os.getenv(key)
     if env_value is not None:
         return env_value
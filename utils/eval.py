@@ -1,40 +1,76 @@
 #!/usr/bin/env python3
 
-import json
-from typing import Dict, Any
-from datetime import datetime, timedelta, timezone
-
-from utils.config import get_config_int, get_config_value, get_config_float
+import orjson
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+
+from utils.config import (
+    get_config_int,
+    get_config_value,
+    get_config_float,
+    get_config_signature,
+)
+
+# Invariant prompt text per source, keyed by config signature
+_prompt_fixtures: Dict[Tuple[Any, ...], Tuple[str, str]] = {}
+
+
+def get_prompt_fixture(config_path) -> Tuple[str, str]:
+    """Get the prompt text that goes before and after the item for a source"""
+    signature = get_config_signature(config_path)
+    fixture = _prompt_fixtures.get(signature)
+    if fixture is None:
+        prefix = "\n\n".join(
+            [
+                get_config_value("prompt_header", config_path),
+                get_config_value("prompt_introduction", config_path),
+                get_config_value("prompt_container_pre", config_path),
+            ]
+        )
+        suffix = "\n\n".join(
+            [
+                get_config_value("prompt_container_post", config_path),
+                get_config_value("prompt_criteria", config_path),
+                get_config_value("prompt_instructions", config_path),
+            ]
+        )
+        fixture = _prompt_fixtures[signature] = (prefix, suffix)
+    return fixture
 
 
 def assemble_prompt(item: Dict[str, Any]) -> str:
     """Assemble the final prompt for an item using the config"""
-    prompt_parts = []
-    config_path = item["config_path"]
-
-    # Add components in the specified order
-    prompt_parts = [
-        get_config_value("prompt_header", config_path),
-        get_config_value("prompt_introduction", config_path),
-        get_config_value("prompt_container_pre", config_path),
-        item["title"],
-        json.dumps(item["input"]),
-        get_config_value("prompt_container_post", config_path),
-        get_config_value("prompt_criteria", config_path),
-        get_config_value("prompt_instructions", config_path),
-    ]
+    prefix, suffix = get_prompt_fixture(item["config_path"])
 
-    return "\n\n".join(prompt_parts)
+    # Only the item content varies between prompts for the same source
+    item_input = orjson.dumps(item["input"]).decode("utf-8")
+    return f"{prefix}\n\n{item['title']}\n\n{item_input}\n\n{suffix}"
 
 
 def is_item_important(item: Dict[str, Any]) -> bool:
     """Check if an item meets the importance score cutoff"""
-    min_score = get_config_float("min_email_score", item["config_path"], 70.0)
-    return (item.get("weighted_score") or 0) >= min_score
+    # Items that haven't been evaluated yet have no score to compare
+    score = item.get("weighted_score")
+    if score is None:
+        return False
+    return score >= get_config_float("min_email_score", item["config_path"], 70.0)
 
 
-def is_item_recent(item: Dict[str, Any]) -> bool:
-    """Check if an item was created within the lookback period"""
+@lru_cache(maxsize=4096)
+def parse_timestamp(date_str: str) -> float:
+    """Parse an ISO format datetime string into a POSIX timestamp"""
+    # fromisoformat accepts a trailing Z since Python 3.11
+    return datetime.fromisoformat(date_str).timestamp()
+
+
+def is_item_recent(item: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """
+    Check if an item was created within the lookback period.
+    Pass `now` as a POSIX timestamp to share one reference time across many items.
+    """
     lookback_days = get_config_int("lookback_days", item["config_path"], 7)
     if lookback_days <= 0:
         return True  # No date filtering
@@ -44,37 +80,36 @@ def is_item_recent(item: Dict[str, Any]) -> bool:
         if not item_date_str:
             return True  # If no date info, include it
 
-        # Parse ISO format datetime
-        if item_date_str.endswith("Z"):
-            item_date_str = item_date_str[:-1] + "+00:00"
-
-        item_date = datetime.fromisoformat(item_date_str)
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+        item_ts = parse_timestamp(item_date_str)
+        cutoff_ts = (now if now is not None else time.time()) - lookback_days * 86400
 
-        return item_date >= cutoff_date
+        return item_ts >= cutoff_ts
     except (ValueError, AttributeError):
-        print(f"Failed to parse date: {item_date_str}")
+        print(f"Failed to parse date: {item_date_str}", file=sys.stderr)
         return True  # If we can't parse the date, include it
 
 
 def needs_evaluation(item: Dict[str, Any], eval_round_num: int) -> bool:
     """Check if an item needs evaluation for the current pass"""
     num_evals_passed = item["num_evals"]
-    queued_to_reevaluate = num_evals_passed < eval_round_num
-    been_evaluated_a_lot = num_evals_passed > 5
-    high_confidence = item["median_confidence"] and item["median_confidence"] > 80
-    obviously_good = item["weighted_score"] and item["weighted_score"] > 80
-    obviously_bad = item["weighted_score"] and item["weighted_score"] < 20
+
+    # Standard mode: Only if queued
+    if num_evals_passed >= eval_round_num:
+        return False
+
+    # Items with only a few evals always get another one
+    if num_evals_passed <= 5:
+        return True
+
+    median_confidence = item["median_confidence"]
+    weighted_score = item["weighted_score"]
+    high_confidence = median_confidence and median_confidence > 80
+    obviously_good = weighted_score and weighted_score > 80
+    obviously_bad = weighted_score and weighted_score < 20
 
     # Big brain time: If we're confident that the item is good or bad, don't evaluate it again
-    if (
-        queued_to_reevaluate
-        and been_evaluated_a_lot
-        and high_confidence
-        and (obviously_good or obviously_bad)
-    ):
+    if high_confidence and (obviously_good or obviously_bad):
         print(f"Skipping: {item['title']} (bigbrain)")
         return False
 
-    # Standard mode: Only if queued
-    return queued_to_reevaluate
+    return True